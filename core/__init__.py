@@ -3,7 +3,7 @@ from .cognitive_cycle import CognitiveCycle
 from .skill_system import SkillSystem, Skill, SkillLevel
 from .safety_system import SafetySystem, SafetyMode
 from .autonomous_life import AutonomousLife
-from .analyzer import TextAnalyzer, ResponseGenerator
+from .analyzer import TextAnalyzer, ResponseGenerator, KeywordScanner, try_eval_math
 
 __all__ = [
     'EmotionEngine', 'EmotionType', 'PADState',
@@ -11,5 +11,5 @@ __all__ = [
     'SkillSystem', 'Skill', 'SkillLevel',
     'SafetySystem', 'SafetyMode',
     'AutonomousLife',
-    'TextAnalyzer', 'ResponseGenerator',
+    'TextAnalyzer', 'ResponseGenerator', 'KeywordScanner', 'try_eval_math',
 ]
@@ -1,16 +1,42 @@
 """Когнитивный цикл с планированием, эмоциями, навыками и онлайн-режимом."""
 
-import re
-import operator
-from typing import Dict, Any, List, Tuple
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Any, List, Set, Tuple
 
 from modules.online_brain import OnlineBrain
-from .analyzer import TextAnalyzer, ResponseGenerator
+from .analyzer import TextAnalyzer, ResponseGenerator, KeywordScanner, try_eval_math
 from .emotion_engine import EmotionEngine, EmotionType
 from .skill_system import SkillSystem
 from .safety_system import SafetySystem
 
 
+# Слова-триггеры: тег -> слова. Сканируются одним проходом через KeywordScanner.
+_TRIGGERS = {
+    # эмоции
+    "greet": ("привет", "здравствуй", "добрый"),
+    "sad": ("грустно", "плохо", "печаль"),
+    "anger": ("злюсь", "бесит", "раздражает"),
+    # намерения
+    "ask_capabilities": ("что ты умеешь", "что ты можешь", "кто ты"),
+    "ask_advice": ("совет", "подскажи", "как мне", "что делать"),
+    "seek_support": ("грустно", "плохо", "одиноко", "тяжело"),
+    "search_skill": ("поиск_в_интернете",),
+    "want_fun": ("игра", "играть", "скучно"),
+    # навыки
+    "skill_greeting": ("привет", "пока", "спасибо"),
+    "skill_search": ("найди", "поищи", "загугли", "поиск_в_интернете"),
+    "skill_empathy": ("грустно", "плохо", "расстроен", "одиноко"),
+    # fallback-ответы
+    "how_are_you": ("как дела",),
+    "what_can_you_do": ("что ты умеешь", "что ты можешь"),
+    "who_are_you": ("кто ты",),
+}
+
+# Темы, по которым копится профиль пользователя
+_TOPIC_WORDS = ("игры", "работа", "учёба", "семья", "проект")
+
+
 class CognitiveCycle:
     def __init__(self, api_key: str = None):
         self.api_key = api_key
@@ -20,11 +46,15 @@ class CognitiveCycle:
         self.safety = SafetySystem()
         self.online_brain = OnlineBrain()
         self.response_generator = ResponseGenerator(self.online_brain)
+        self._scanner = KeywordScanner(_TRIGGERS)
 
-        self.memory: List[Dict[str, Any]] = []
-        self.working_memory: List[Dict[str, str]] = []
+        # Ограниченные очереди: самые старые записи вытесняются за O(1)
+        self.memory: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self.working_memory: Deque[Dict[str, str]] = deque(maxlen=20)
         self.cycle_count = 0
         self.client = None
+        # Значения, которые не меняются в пределах одного цикла
+        self._cache: Dict[str, Any] = {}
 
         self.user_profile: Dict[str, Any] = {
             "name": None,
@@ -43,6 +73,7 @@ class CognitiveCycle:
 
     def run_cycle(self, user_input: str) -> str:
         self.cycle_count += 1
+        self._cache.clear()
 
         safe, msg = self._perceive(user_input)
         if not safe:
@@ -51,60 +82,58 @@ class CognitiveCycle:
         self._update_working_memory(user_input)
         context = self._apply_attention()
         retrieved = self._retrieve_memory(user_input)
-        self._update_emotion(user_input)
+        # Нижний регистр считается один раз и передаётся дальше
+        text_lower = user_input.lower()
+        hits = self._scanner.scan(text_lower)
+        self._update_emotion(user_input, hits)
+        self._cache["dominant"] = self.emotion.get_dominant_emotion()
 
-        intent = self._infer_intent(user_input)
+        intent = self._infer_intent(text_lower, hits)
         goals = self._form_goals(intent)
         plan = self._make_plan(intent, goals, context, retrieved)
-        response = self._run_plan(plan, user_input, context, retrieved)
+        response = self._run_plan(plan, user_input, context, retrieved, text_lower, hits)
 
-        self._learn(user_input, response, context, retrieved, intent, goals)
+        self._learn(user_input, response, context, retrieved, intent, goals, hits, text_lower)
         self._cleanup()
 
         return response
 
+    def close(self) -> None:
+        """Освободить ресурсы онлайн-модуля (потоки и HTTP-сессии)."""
+        self.online_brain.close()
+
     def _perceive(self, user_input: str) -> Tuple[bool, str]:
         safe, msg = self.safety.check_input(user_input)
         return safe, msg
 
     def _update_working_memory(self, user_input: str) -> None:
         self.working_memory.append({"role": "user", "content": user_input})
-        if len(self.working_memory) > 20:
-            self.working_memory = self.working_memory[-20:]
 
     def _apply_attention(self) -> List[Dict[str, str]]:
-        return self.working_memory[-10:]
+        return list(islice(self.working_memory, max(0, len(self.working_memory) - 10), None))
 
     def _retrieve_memory(self, user_input: str) -> List[Dict[str, Any]]:
-        return self.memory[-5:]
+        return list(islice(self.memory, max(0, len(self.memory) - 5), None))
 
-    def _update_emotion(self, text: str) -> None:
-        t = text.lower()
-        if any(w in t for w in ["привет", "здравствуй", "добрый"]):
+    def _update_emotion(self, text: str, hits: Set[str]) -> None:
+        if "greet" in hits:
             self.emotion.apply_stimulus(EmotionType.JOY, 0.3)
-        elif any(w in t for w in ["грустно", "плохо", "печаль"]):
+        elif "sad" in hits:
             self.emotion.apply_stimulus(EmotionType.SADNESS, 0.4)
-        elif any(w in t for w in ["злюсь", "бесит", "раздражает"]):
+        elif "anger" in hits:
             self.emotion.apply_stimulus(EmotionType.ANGER, 0.3)
         elif "?" in text:
             self.emotion.apply_stimulus(EmotionType.INTEREST, 0.2)
 
-    def _infer_intent(self, text: str) -> str:
-        t = text.lower()
+    def _infer_intent(self, text_lower: str, hits: Set[str]) -> str:
+        t = text_lower
         if t.startswith("/status"):
             return "status"
         if t.startswith("/reset"):
             return "reset"
-        if any(w in t for w in ["что ты умеешь", "что ты можешь", "кто ты"]):
-            return "ask_capabilities"
-        if any(w in t for w in ["совет", "подскажи", "как мне", "что делать"]):
-            return "ask_advice"
-        if any(w in t for w in ["грустно", "плохо", "одиноко", "тяжело"]):
-            return "seek_support"
-        if "поиск_в_интернете" in t:
-            return "search_skill"
-        if any(w in t for w in ["игра", "играть", "скучно"]):
-            return "want_fun"
+        for intent in ("ask_capabilities", "ask_advice", "seek_support", "search_skill", "want_fun"):
+            if intent in hits:
+                return intent
         if "?" in t:
             return "generic_question"
         return "smalltalk"
@@ -149,7 +178,7 @@ class CognitiveCycle:
 
         return plan or ["use_fallback_logic"]
 
-    def _run_plan(self, plan: List[str], user_input: str, context, retrieved) -> str:
+    def _run_plan(self, plan: List[str], user_input: str, context, retrieved, text_lower: str, hits: Set[str]) -> str:
         if "do_reset_memory" in plan:
             self.working_memory.clear()
             self.memory.clear()
@@ -160,7 +189,7 @@ class CognitiveCycle:
             return f"Цикл: {state['cycle']}, эмоция: {state['emotion']} ({state['confidence']:.0%}), настроение: {state['mood']}."
 
         if "generate_support_message" in plan:
-            emotion, _ = self.emotion.get_dominant_emotion()
+            emotion, _ = self._dominant_emotion()
             return f"Слышу, что тебе непросто. Сейчас я ощущаю {emotion.value}. Хочешь рассказать подробнее?"
 
         if "describe_capabilities" in plan:
@@ -181,18 +210,23 @@ class CognitiveCycle:
             return "Давай сыграем! Я загадаю число от 1 до 10, а ты угадай."
 
         if "query_llm" in plan and self.client:
-            return self._generate_llm_response(user_input, context, retrieved)
+            return self._generate_llm_response(user_input, context, retrieved, text_lower, hits)
 
         if "keep_conversation" in plan:
             last = self.memory[-1] if self.memory else None
             if last and len(last.get("input", "")) > 3:
                 return f"Мы недавно обсуждали: \"{last['input']}\". Продолжим или сменим тему?"
 
-        generated = self.response_generator.generate(user_input, context)
+        generated = self.response_generator.generate(user_input, context, text_lower)
         if generated:
             return generated
 
-        return self._fallback_response(user_input)
+        return self._fallback_response(user_input, text_lower, hits)
+
+    def _dominant_emotion(self) -> Tuple[EmotionType, float]:
+        """Доминирующая эмоция: внутри цикла — из кэша, вне цикла — свежий расчёт."""
+        cached = self._cache.get("dominant")
+        return cached if cached is not None else self.emotion.get_dominant_emotion()
 
     def _online_search_response(self, text: str) -> str:
         query = text.strip()
@@ -200,11 +234,11 @@ class CognitiveCycle:
             return "Нужно что-то для поиска. Попробуй сформулировать запрос."
         return self.online_brain.answer(query)
 
-    def _generate_llm_response(self, user_input: str, context, retrieved) -> str:
+    def _generate_llm_response(self, user_input: str, context, retrieved, text_lower: str, hits: Set[str]) -> str:
         if not self.client:
-            return self._fallback_response(user_input)
+            return self._fallback_response(user_input, text_lower, hits)
         try:
-            emotion, conf = self.emotion.get_dominant_emotion()
+            emotion, conf = self._dominant_emotion()
             messages = [{"role": "system", "content": f"Ты AI-компаньон. Эмоция: {emotion.value} ({conf:.0%}). Отвечай кратко."}]
             messages.extend([{"role": m["role"], "content": m["content"]} for m in context])
             messages.append({"role": "user", "content": user_input})
@@ -213,42 +247,24 @@ class CognitiveCycle:
         except Exception as e:
             return f"Ошибка API: {e}"
 
-    def _fallback_response(self, text: str) -> str:
-        t = text.lower().strip()
+    def _fallback_response(self, text: str, text_lower: str, hits: Set[str]) -> str:
+        t = text_lower.strip()
 
-        if any(w in t for w in ["привет", "здравствуй", "добрый"]):
+        if "greet" in hits:
             return "Привет! Рад тебя видеть 🙂"
 
-        if "как дела" in t:
-            emotion, _ = self.emotion.get_dominant_emotion()
+        if "how_are_you" in hits:
+            emotion, _ = self._dominant_emotion()
             return f"У меня всё неплохо, чувствую {emotion.value}. А у тебя как?"
 
-        m = re.fullmatch(r"\s*(\d+)\s*([+\-*/])\s*(\d+)\s*", t)
-        if m:
-            a, op, b = int(m.group(1)), m.group(2), int(m.group(3))
-            ops = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
-            try:
-                res = ops[op](a, b)
-                res = int(res) if isinstance(res, float) and res.is_integer() else res
-                return f"{a} {op} {b} = {res}"
-            except Exception:
-                pass
-
-        m2 = re.search(r"сколько\s+(?:будет\s+)?(\d+)\s*([+\-*/])\s*(\d+)", t)
-        if m2:
-            a, op, b = int(m2.group(1)), m2.group(2), int(m2.group(3))
-            ops = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
-            try:
-                res = ops[op](a, b)
-                res = int(res) if isinstance(res, float) and res.is_integer() else res
-                return f"{a} {op} {b} = {res}"
-            except Exception:
-                pass
+        solved = try_eval_math(t)
+        if solved:
+            return solved
 
-        if any(w in t for w in ["что ты умеешь", "что ты можешь"]):
+        if "what_can_you_do" in hits:
             return "Я могу говорить, запоминать контекст, реагировать эмоциями и прокачивать навыки."
 
-        if "кто ты" in t:
+        if "who_are_you" in hits:
             return "Я экспериментальный ИИ-компаньон, который учится на общении с тобой."
 
         if "?" in text:
@@ -256,16 +272,15 @@ class CognitiveCycle:
 
         return "Понял тебя. Можешь рассказать подробнее?"
 
-    def _update_skills(self, text: str) -> None:
-        t = text.lower()
-        if any(w in t for w in ["привет", "пока", "спасибо"]):
+    def _update_skills(self, hits: Set[str]) -> None:
+        if "skill_greeting" in hits:
             self.skills.use_skill("приветствие")
-        if any(w in t for w in ["найди", "поищи", "загугли", "поиск_в_интернете"]):
+        if "skill_search" in hits:
             self.skills.use_skill("поиск_в_интернете")
-        if any(w in t for w in ["грустно", "плохо", "расстроен", "одиноко"]):
+        if "skill_empathy" in hits:
             self.skills.use_skill("эмпатия")
 
-    def _learn(self, user_input: str, response: str, context, retrieved, intent: str, goals: List[str]) -> None:
+    def _learn(self, user_input: str, response: str, context, retrieved, intent: str, goals: List[str], hits: Set[str], text_lower: str) -> None:
         episode = {
             "input": user_input,
             "output": response,
@@ -275,24 +290,24 @@ class CognitiveCycle:
             "goals": goals,
         }
         self.memory.append(episode)
-        if len(self.memory) > 100:
-            self.memory = self.memory[-100:]
 
-        self._update_skills(user_input)
+        self._update_skills(hits)
 
-        t = user_input.lower()
+        t = text_lower
         topics = self.user_profile["topics"]
-        for word in ["игры", "работа", "учёба", "семья", "проект"]:
+        for word in _TOPIC_WORDS:
             if word in t:
                 topics[word] = topics.get(word, 0) + 1
 
     def _cleanup(self) -> None:
         self.emotion.decay()
+        # После распада эмоций кэш цикла устарел; get_state() снаружи считает заново
+        self._cache.clear()
         if hasattr(self.skills, "tick"):
             self.skills.tick()
 
-        def get_state(self) -> Dict[str, Any]:
-        emotion, confidence = self.emotion.get_dominant_emotion()
+    def get_state(self) -> Dict[str, Any]:
+        emotion, confidence = self._dominant_emotion()
         return {
             "cycle": self.cycle_count,
             "emotion": emotion.value,
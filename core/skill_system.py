@@ -1,10 +1,12 @@
 """Система навыков с прокачкой и фоновым развитием."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 import math
 
+import numpy as np
+
 
 class SkillLevel(Enum):
     NOVICE = "Новичок"
@@ -14,8 +16,9 @@ class SkillLevel(Enum):
     EXPERT = "Эксперт"
 
 
-@dataclass
+@dataclass(slots=True)
 class Skill:
+    # experience/level/last_used_cycle меняет только SkillSystem (см. её докстринг)
     name: str
     category: str
     experience: float = 0.0
@@ -26,6 +29,15 @@ class Skill:
 
 
 class SkillSystem:
+    """
+    Навыки с прокачкой и фоновым развитием.
+    Опыт и цикл последнего использования хранятся в массивах _xp/_last_used —
+    это источник истины для tick(). Объекты Skill из skills/get_skill() отдаются
+    для чтения: опыт меняется только через use_skill(), новые навыки
+    добавляются через add_skill(). Прямая запись в Skill.experience будет
+    перезаписана следующим tick().
+    """
+
     XP_THRESHOLDS = {
         SkillLevel.NOVICE: 0,
         SkillLevel.BEGINNER: 100,
@@ -33,11 +45,25 @@ class SkillSystem:
         SkillLevel.ADVANCED: 2000,
         SkillLevel.EXPERT: 10000,
     }
+    # Таблицы уровней считаются один раз при создании класса
+    _LEVEL_ORDER = {level: i for i, level in enumerate(SkillLevel)}
+    _THRESHOLDS_DESC = tuple(sorted(XP_THRESHOLDS.items(), key=lambda item: item[1], reverse=True))
+    _LEVELS_ASC = tuple(level for level, _ in reversed(_THRESHOLDS_DESC))
+    _THRESHOLDS_ASC = np.array([threshold for _, threshold in reversed(_THRESHOLDS_DESC)], dtype=np.float64)
 
     def __init__(self):
         self.skills: Dict[str, Skill] = {}
         self.total_experience = 0.0
         self.current_cycle = 0
+        # (total_experience, уровень) последнего расчёта get_total_level()
+        self._total_level_cache: Optional[Tuple[float, int]] = None
+
+        # Параллельные массивы (SoA) для векторного tick(): индекс навыка = позиция в _skill_list
+        self._skill_list: List[Skill] = []
+        self._index: Dict[str, int] = {}
+        self._xp = np.zeros(0, dtype=np.float64)
+        self._last_used = np.zeros(0, dtype=np.int64)
+
         self._init_default_skills()
 
     def _init_default_skills(self):
@@ -49,16 +75,25 @@ class SkillSystem:
             ("креативность", "творческие", ["creative"]),
         ]
         for name, cat, tags in defaults:
-            self.skills[name] = Skill(name=name, category=cat, tags=tags)
+            self.add_skill(name, cat, tags)
+
+    def add_skill(self, name: str, category: str = "общение", tags: Optional[List[str]] = None) -> Skill:
+        """Зарегистрировать навык (или вернуть уже существующий)."""
+        if name in self.skills:
+            return self.skills[name]
+        skill = Skill(name=name, category=category, tags=list(tags or []))
+        self._index[skill.name] = len(self._skill_list)
+        self._skill_list.append(skill)
+        self.skills[skill.name] = skill
+        self._xp = np.append(self._xp, skill.experience)
+        self._last_used = np.append(self._last_used, skill.last_used_cycle)
+        return skill
 
     # =============== Активное использование ===============
 
     def use_skill(self, name: str, success: bool = True, cycle: Optional[int] = None) -> float:
         """Прокачка навыка при явном использовании."""
-        if name not in self.skills:
-            self.skills[name] = Skill(name=name, category="общение")
-
-        skill = self.skills[name]
+        skill = self.add_skill(name)
         base_xp = 10 if success else 3
         bonus = 1.0 + (skill.uses * 0.01)
         xp = base_xp * min(bonus, 2.0)
@@ -67,13 +102,17 @@ class SkillSystem:
         skill.uses += 1
         skill.last_used_cycle = cycle if cycle is not None else self.current_cycle
 
+        i = self._index[name]
+        self._xp[i] = skill.experience
+        self._last_used[i] = skill.last_used_cycle
+
         self.total_experience += xp
         self._update_level(skill)
         return xp
 
     def _update_level(self, skill: Skill) -> None:
-        for level in reversed(list(SkillLevel)):
-            if skill.experience >= self.XP_THRESHOLDS[level]:
+        for level, threshold in self._THRESHOLDS_DESC:
+            if skill.experience >= threshold:
                 skill.level = level
                 break
 
@@ -91,18 +130,26 @@ class SkillSystem:
         passive_xp = 0.5 * cycles
         self.total_experience += passive_xp
 
-        # Лёгкая коррекция навыков
-        for skill in self.skills.values():
-            # Чуть-чуть пассивного опыта всем
-            skill.experience += passive_xp / max(len(self.skills), 1)
+        if not self._skill_list:
+            return
+
+        # Лёгкая коррекция навыков — сразу для всех, векторно
+        xp = self._xp
+        # Чуть-чуть пассивного опыта всем
+        xp += passive_xp / len(self._skill_list)
+
+        # Если навык давно не использовали — немного «забывает»
+        stale = ((self.current_cycle - self._last_used) > 50) & (xp > 0)
+        # Та же последовательность операций, что и в поскалярном варианте: x - x * 0.001 * cycles
+        decay = xp[stale] * 0.001 * cycles  # очень слабый распад
+        xp[stale] = np.maximum(0.0, xp[stale] - decay)
 
-            # Если навык давно не использовали — немного «забывает»
-            cycles_since_use = self.current_cycle - skill.last_used_cycle
-            if cycles_since_use > 50 and skill.experience > 0:
-                decay = skill.experience * 0.001 * cycles  # очень слабый распад
-                skill.experience = max(0.0, skill.experience - decay)
+        levels = np.searchsorted(self._THRESHOLDS_ASC, xp, side="right") - 1
 
-            self._update_level(skill)
+        # Объекты Skill читают GUI и Telegram — переносим в них итог
+        for skill, experience, level in zip(self._skill_list, xp.tolist(), levels.tolist()):
+            skill.experience = experience
+            skill.level = self._LEVELS_ASC[level]
 
     # =============== Чтение состояния ===============
 
@@ -114,12 +161,16 @@ class SkillSystem:
         skill = self.skills.get(name)
         if not skill:
             return 0
-        order = list(SkillLevel)
-        return order.index(skill.level)
+        return self._LEVEL_ORDER[skill.level]
 
     def get_total_level(self) -> int:
         """Общий уровень развития системы навыков (для отображения LVL)."""
-        return int(math.log10(self.total_experience + 1) * 2) + 1
+        cache = self._total_level_cache
+        if cache is not None and cache[0] == self.total_experience:
+            return cache[1]
+        level = int(math.log10(self.total_experience + 1) * 2) + 1
+        self._total_level_cache = (self.total_experience, level)
+        return level
 
     def get_skills_by_category(self, category: str) -> List[Skill]:
         return [s for s in self.skills.values() if s.category == category]
@@ -290,4 +290,5 @@ class MainWindowSciFi(QMainWindow):
     def closeEvent(self, event):
         """Очистка при закрытии"""
         self.tts_engine.stop()
+        self.cognitive.close()
         super().closeEvent(event)
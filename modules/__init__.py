@@ -1,19 +1,39 @@
-from .desktop_avatar import AvatarManager, DesktopAvatar
-from .tts_engine import TTSEngine, TTSConfig, TTSStatus
-from .telegram_integration import TelegramBot, TelegramManager, TelegramConfig
-from .face_emotion import (
-    FaceEmotionDetector,
-    FaceEmotionManager,
-    FaceEmotionConfig,
-    EmotionResult,
-)
-from .calendar_integration import (
-    GoogleCalendarAPI,
-    CalendarManager,
-    CalendarConfig,
-    CalendarEvent,
-)
-from .online_brain import OnlineBrain  # новый импорт
+# Подмодули тянут тяжёлые зависимости (Tk, PIL, OpenCV, Google API, BS4),
+# поэтому импортируются лениво — при первом обращении к имени (PEP 562).
+_LAZY = {
+    "AvatarManager": "desktop_avatar",
+    "DesktopAvatar": "desktop_avatar",
+    "TTSEngine": "tts_engine",
+    "TTSConfig": "tts_engine",
+    "TTSStatus": "tts_engine",
+    "TelegramBot": "telegram_integration",
+    "TelegramManager": "telegram_integration",
+    "TelegramConfig": "telegram_integration",
+    "FaceEmotionDetector": "face_emotion",
+    "FaceEmotionManager": "face_emotion",
+    "FaceEmotionConfig": "face_emotion",
+    "EmotionResult": "face_emotion",
+    "GoogleCalendarAPI": "calendar_integration",
+    "CalendarManager": "calendar_integration",
+    "CalendarConfig": "calendar_integration",
+    "CalendarEvent": "calendar_integration",
+    "OnlineBrain": "online_brain",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    module = importlib.import_module(f".{_LAZY[name]}", __name__)
+    attr = getattr(module, name)
+    globals()[name] = attr
+    return attr
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 
 __all__ = [
@@ -2,11 +2,30 @@
 
 import re
 import textwrap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Hashable, List, Optional
 
 import requests
 from bs4 import BeautifulSoup  # pip install beautifulsoup4
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser  # pip install selectolax — быстрый парсер на C
+
+try:
+    import requests_cache  # pip install requests-cache — дисковый кэш HTTP-ответов
+except ImportError:
+    requests_cache = None
+
+try:
+    import lxml  # noqa: F401  # pip install lxml — парсер на C для выдачи Google
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+_MISSING = object()
+_WS_RE = re.compile(r"\s+")
 
 
 @dataclass
@@ -16,6 +35,29 @@ class SearchResult:
     snippet: str
 
 
+class _LRUCache:
+    """Ограниченный кэш: при переполнении вытесняется давно не использованный ключ."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()  # страницы качаются из нескольких потоков
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
 class OnlineBrain:
     USER_AGENT = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -23,17 +65,90 @@ class OnlineBrain:
         "Chrome/120.0 Safari/537.36"
     )
 
-    def __init__(self, timeout: int = 10):
+    _ALLOWED_DOMAINS = (
+        "github.com",
+        "stackoverflow.com",
+        "royallib.com",
+        "bookscafe.net",
+        "arxiv.org",
+        "researchgate.net",
+        "edx.org",
+        "developer.mozilla.org",
+        "w3schools.com",
+        "devdocs.io",
+        "proofwiki.org",
+        "mathworld.wolfram.com",
+        "engineeringtoolbox.com",
+        "allaboutcircuits.com",
+    )
+    _ALLOWED_RE = re.compile("|".join(re.escape(d) for d in _ALLOWED_DOMAINS))
+
+    POOL_SIZE = 32
+    MAX_FETCH_WORKERS = 3
+    HTTP_CACHE_NAME = ".onlinebrain_cache"
+    HTTP_CACHE_TTL = 3600  # секунд
+
+    def __init__(self, timeout: int = 10, cache_size: int = 256):
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": self.USER_AGENT})
+        # У каждого потока своя сессия: общий пул соединений не делится под блокировкой
+        self._tls = threading.local()
+        # Все созданные сессии — чтобы close() мог закрыть и сессии рабочих потоков
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        # Пул живёт вместе с объектом, чтобы потоки и их сессии переиспользовались
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_FETCH_WORKERS)
+
+        # Повторные запросы отдаются из памяти без сети и разбора HTML
+        self._search_cache = _LRUCache(cache_size)
+        self._page_cache = _LRUCache(cache_size)
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._tls, "session", None)
+        if session is None:
+            session = self._make_session()
+            self._tls.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        """Остановить пул загрузок и закрыть все HTTP-сессии (и их кэш на диске)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        self._tls = threading.local()
+        for session in sessions:
+            session.close()
+
+    def _make_session(self) -> requests.Session:
+        """
+        Сессия с keep-alive пулом соединений.
+        Если установлен requests-cache, ответы ещё и кэшируются на диске (SQLite).
+        """
+        if requests_cache is not None:
+            session = requests_cache.CachedSession(
+                cache_name=self.HTTP_CACHE_NAME,
+                backend="sqlite",
+                expire_after=self.HTTP_CACHE_TTL,
+            )
+        else:
+            session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # Accept-Encoding: gzip, deflate requests выставляет сам
+        session.headers.update({"User-Agent": self.USER_AGENT})
+        return session
 
     # ====== Внешний интерфейс ======
 
     def answer(self, query: str) -> str:
         """
         Попробовать найти ответ онлайн и вернуть короткий конспект.
-        Сейчас: гугл-поиск + извлечение текста с первой подходящей страницы.
+        Сейчас: гугл-поиск + параллельное извлечение текста с найденных страниц,
+        берётся первая страница, с которой текст удалось извлечь.
         """
         try:
             results = self.search_google(query)
@@ -41,7 +156,7 @@ class OnlineBrain:
                 return "Я попробовал поискать в сети, но ничего полезного не нашёл."
 
             best = results[0]
-            text = self.fetch_and_summarize(best.url)
+            text = self._fetch_first(results)
 
             if not text:
                 return f"Нашёл что-то по запросу: {best.title} ({best.url}), но не смог аккуратно извлечь текст."
@@ -51,6 +166,27 @@ class OnlineBrain:
             # В проде логировать, здесь просто fallback
             return "Во время онлайн-поиска произошла ошибка. Давай попробуем сформулировать вопрос иначе?"
 
+    def _fetch_first(self, results: List[SearchResult]) -> Optional[str]:
+        """Качает страницы одновременно и возвращает первый готовый непустой конспект."""
+        futures = [self._executor.submit(self._try_fetch, r.url) for r in results]
+        try:
+            for future in as_completed(futures):
+                text = future.result()
+                if text:
+                    return text
+            return None
+        finally:
+            # Не ждём оставшиеся загрузки — ответ уже есть
+            for future in futures:
+                future.cancel()
+
+    def _try_fetch(self, url: str) -> Optional[str]:
+        try:
+            return self.fetch_and_summarize(url)
+        except Exception:
+            # Одна неудачная страница не должна ломать весь ответ
+            return None
+
     # ====== Google-поиск (упрощённо) ======
 
     def search_google(self, query: str, num: int = 3) -> List[SearchResult]:
@@ -58,11 +194,15 @@ class OnlineBrain:
         Очень простой поиск через HTML Google.
         Для серьёзного проекта лучше использовать оф. API.
         """
+        cached = self._search_cache.get((query, num), _MISSING)
+        if cached is not _MISSING:
+            return list(cached)
+
         params = {"q": query, "hl": "ru"}
         resp = self.session.get("https://www.google.com/search", params=params, timeout=self.timeout)
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(resp.text, _HTML_PARSER)
         results: List[SearchResult] = []
 
         for g in soup.select("div.g"):
@@ -83,43 +223,37 @@ class OnlineBrain:
             if len(results) >= num:
                 break
 
+        self._search_cache.put((query, num), tuple(results))
         return results
 
     def _allowed_domain(self, url: str) -> bool:
-        allowed = [
-            "github.com",
-            "stackoverflow.com",
-            "royallib.com",
-            "bookscafe.net",
-            "arxiv.org",
-            "researchgate.net",
-            "edx.org",
-            "developer.mozilla.org",
-            "w3schools.com",
-            "devdocs.io",
-            "proofwiki.org",
-            "mathworld.wolfram.com",
-            "engineeringtoolbox.com",
-            "allaboutcircuits.com",
-        ]
-        return any(domain in url for domain in allowed)
+        return self._ALLOWED_RE.search(url) is not None
 
     # ====== Извлечение текста и краткий конспект ======
 
     def fetch_and_summarize(self, url: str, max_chars: int = 600) -> Optional[str]:
+        cached = self._page_cache.get((url, max_chars), _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        summary = self._summarize_page(url, max_chars)
+        self._page_cache.put((url, max_chars), summary)
+        return summary
+
+    def _summarize_page(self, url: str, max_chars: int) -> Optional[str]:
         resp = self.session.get(url, timeout=self.timeout)
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+        tree = LexborHTMLParser(resp.text)
 
         # Убираем скрипты/стили
-        for tag in soup(["script", "style", "noscript"]):
+        for tag in tree.css("script, style, noscript"):
             tag.decompose()
 
         # Простой текст из параграфов
-        paragraphs = [p.get_text(" ", strip=True) for p in soup.find_all("p")]
+        paragraphs = [p.text(separator=" ", strip=True) for p in tree.css("p")]
         text = " ".join(paragraphs)
-        text = re.sub(r"\s+", " ", text).strip()
+        text = _WS_RE.sub(" ", text).strip()
 
         if not text:
             return None
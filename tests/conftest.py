@@ -0,0 +1,23 @@
+"""Общие настройки тестов."""
+
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# core/__init__ импортирует autonomous_life, которому нужен PyQt6.
+# Для тестов ядра GUI не нужен — подставляем заглушку, если PyQt6 не установлен.
+try:
+    import PyQt6.QtCore  # noqa: F401
+except ImportError:
+    qtcore = types.ModuleType("PyQt6.QtCore")
+    qtcore.QObject = object
+    qtcore.QTimer = object
+    qtcore.pyqtSignal = lambda *args, **kwargs: None
+    pyqt = types.ModuleType("PyQt6")
+    pyqt.QtCore = qtcore
+    sys.modules["PyQt6"] = pyqt
+    sys.modules["PyQt6.QtCore"] = qtcore
@@ -0,0 +1,52 @@
+"""Тесты KeywordScanner."""
+
+from core.analyzer import KeywordScanner, try_eval_math
+from core.cognitive_cycle import _TRIGGERS
+
+
+TRIGGERS = {
+    "want_fun": ("игра", "играть", "скучно"),
+    "game_word": ("игра",),
+    "ask_capabilities": ("что ты умеешь", "что ты можешь", "кто ты"),
+    "ask_advice": ("совет", "подскажи"),
+    "seek_support": ("грустно", "плохо"),
+}
+
+
+def test_overlapping_triggers_share_tags():
+    scanner = KeywordScanner(TRIGGERS)
+    # «играть» длиннее «игра», но теги более короткого триггера тоже срабатывают
+    assert scanner.scan("давай играть") == {"want_fun", "game_word"}
+    assert scanner.scan("игра") == {"want_fun", "game_word"}
+
+
+def test_multi_word_triggers():
+    scanner = KeywordScanner(TRIGGERS)
+    assert scanner.scan("а что ты умеешь?") == {"ask_capabilities"}
+    assert scanner.scan("что ты") == set()
+
+
+def test_inflected_forms_match_as_substrings():
+    # Реальная таблица триггеров когнитивного цикла
+    scanner = KeywordScanner(_TRIGGERS)
+    assert "want_fun" in scanner.scan("давай поиграем")
+    assert "want_fun" in scanner.scan("хочу поиграть")
+    assert "ask_advice" in scanner.scan("посоветуй что-нибудь")
+
+
+def test_several_categories_in_one_pass():
+    scanner = KeywordScanner(TRIGGERS)
+    assert scanner.scan("мне грустно, подскажи игру") == {"seek_support", "ask_advice"}
+
+
+def test_no_hits():
+    scanner = KeywordScanner(TRIGGERS)
+    assert scanner.scan("ну ладно") == set()
+    assert scanner.scan("") == set()
+
+
+def test_try_eval_math():
+    assert try_eval_math("2 + 3") == "2 + 3 = 5"
+    assert try_eval_math("сколько будет 10/4") == "10 / 4 = 2.5"
+    assert try_eval_math("3/0") is None
+    assert try_eval_math("привет") is None
@@ -0,0 +1,29 @@
+"""Тесты когнитивного цикла."""
+
+from core.cognitive_cycle import CognitiveCycle
+
+
+def test_status_intent():
+    cycle = CognitiveCycle()
+    assert cycle._infer_intent("/status", set()) == "status"
+
+
+def test_status_command_describes_state():
+    cycle = CognitiveCycle()
+    response = cycle.run_cycle("/status")
+    assert response.startswith("Цикл: 1, эмоция: ")
+    assert "настроение: " in response
+
+
+def test_get_state_is_a_method():
+    cycle = CognitiveCycle()
+    cycle.run_cycle("привет")
+    state = cycle.get_state()
+    assert state["cycle"] == 1
+    assert {"emotion", "confidence", "mood", "pad", "total_level", "safety_mode"} <= state.keys()
+
+
+def test_close_releases_online_brain():
+    cycle = CognitiveCycle()
+    cycle.run_cycle("привет")
+    cycle.close()
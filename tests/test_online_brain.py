@@ -0,0 +1,30 @@
+"""Тесты OnlineBrain."""
+
+import threading
+
+from modules.online_brain import OnlineBrain
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_close_releases_sessions_of_all_threads():
+    brain = OnlineBrain()
+    brain._make_session = FakeSession
+
+    main_session = brain.session
+    worker_sessions = []
+    worker = threading.Thread(target=lambda: worker_sessions.append(brain.session))
+    worker.start()
+    worker.join()
+
+    assert worker_sessions[0] is not main_session
+    brain.close()
+    assert main_session.closed
+    assert worker_sessions[0].closed
+
@@ -0,0 +1,39 @@
+"""Тесты SkillSystem."""
+
+from core.skill_system import SkillSystem, SkillLevel
+
+
+def test_use_skill_survives_tick():
+    skills = SkillSystem()
+    skills.use_skill("эмпатия")
+    before = skills.get_skill("эмпатия").experience
+    skills.tick()
+    assert skills.get_skill("эмпатия").experience > before
+
+
+def test_level_is_kept_by_tick():
+    skills = SkillSystem()
+    for _ in range(10):
+        skills.use_skill("анализ")
+    assert skills.get_skill("анализ").level is SkillLevel.BEGINNER
+    skills.tick()
+    assert skills.get_skill("анализ").level is SkillLevel.BEGINNER
+    assert skills.get_level("анализ") == 1
+
+
+def test_add_skill_registers_new_skill():
+    skills = SkillSystem()
+    skill = skills.add_skill("шахматы", "игры", ["logic"])
+    assert skills.add_skill("шахматы") is skill
+    skills.use_skill("шахматы")
+    skills.tick()
+    assert skills.get_skill("шахматы").experience > 10
+
+
+def test_stale_skill_decays():
+    skills = SkillSystem()
+    skills.use_skill("креативность")
+    used = skills.get_skill("креативность").experience
+    skills.tick(cycles=60)
+    passive_share = 0.5 * 60 / len(skills.skills)
+    assert skills.get_skill("креативность").experience < used + passive_share